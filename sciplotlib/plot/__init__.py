@@ -1,2 +1,3 @@
 from .heatmap import *
 from .scatter import *
+from .style import *
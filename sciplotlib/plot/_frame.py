@@ -0,0 +1,88 @@
+import sys
+
+import numpy as np
+
+
+def is_frame(data):
+    """
+    Whether data is a pandas DataFrame or a pyarrow Table.
+    Neither library is imported here: if it has not been imported by the
+    caller, data cannot be one of its tables.
+    :param data: Any object.
+    :return: bool
+    """
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(data, pd.DataFrame):
+        return True
+    pa = sys.modules.get("pyarrow")
+    if pa is not None and isinstance(data, pa.Table):
+        return True
+    return False
+
+
+def column(frame, name, factorize=False):
+    """
+    Get a column of a table as a numpy array without copying when possible.
+    For categorical (pandas) or dictionary-encoded (pyarrow) columns, the
+    integer codes are returned together with the category labels.
+    :param frame: A pandas DataFrame or a pyarrow Table.
+    :param name: Column name.
+    :param factorize: Also encode other non-integer columns (e.g. strings)
+    into codes and labels.
+    :return: (values, labels), labels is None for non-categorical columns.
+    """
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(frame, pd.DataFrame):
+        col = frame[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes = col.cat.codes.to_numpy()
+            assert not (codes < 0).any(), \
+                f"Column {name} must not contain missing values."
+            return codes, [str(c) for c in col.cat.categories]
+        values = col.to_numpy()
+        if factorize and values.dtype.kind not in "iu":
+            codes, uniques = pd.factorize(col, sort=True)
+            assert not (codes < 0).any(), \
+                f"Column {name} must not contain missing values."
+            return codes, [str(c) for c in uniques]
+        return values, None
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    col = frame.column(name)
+    assert col.null_count == 0, \
+        f"Column {name} must not contain missing values."
+    encode = factorize and not pa.types.is_dictionary(col.type) \
+        and not pa.types.is_integer(col.type)
+    if encode:
+        col = col.dictionary_encode()
+    if pa.types.is_dictionary(col.type):
+        if col.num_chunks > 1:
+            col = col.unify_dictionaries()
+        col = col.combine_chunks()
+        codes = col.indices.to_numpy(zero_copy_only=False)
+        dictionary = col.dictionary
+        if encode:
+            # Sort labels by value, as pd.factorize(sort=True) does.
+            order = pc.array_sort_indices(dictionary).to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            codes = rank[codes]
+            dictionary = dictionary.take(order)
+        return codes, [str(c) for c in dictionary.to_pylist()]
+    return col.to_numpy(), None
+
+
+def matrix(frame):
+    """
+    Get a (pivoted) table as a 2-D numpy array with its labels.
+    :param frame: A pandas DataFrame or a pyarrow Table.
+    :return: (data, x_labels, y_labels), y_labels is None for pyarrow.
+    """
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(frame, pd.DataFrame):
+        return (frame.to_numpy(),
+                [str(c) for c in frame.columns],
+                [str(i) for i in frame.index])
+    data = np.column_stack([c.to_numpy() for c in frame.columns])
+    return data, [str(c) for c in frame.column_names], None
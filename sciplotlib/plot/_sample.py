@@ -0,0 +1,118 @@
+import numpy as np
+
+# Grid resolution used to estimate point density for outlier retention.
+density_bins = 64
+
+
+def subsample(x, y, bucket, max_points, min_points=10, outlier_count=0,
+              seed=0):
+    """
+    Stratified random subsampling of points in a single vectorized pass.
+    Every bucket gets a share of max_points proportional to its size, but
+    at least min_points (and at least one), or all of its points if it has
+    fewer.
+    The work over all N points is linear: candidates are drawn by a
+    Bernoulli pass with a slightly oversampled per-bucket probability, and
+    only the candidates are ranked to keep the exact share of every bucket.
+    :param x: An N-dimensional numpy array.
+    :param y: An N-dimensional numpy array.
+    :param bucket: An N-dimensional int numpy array, or None for one bucket.
+    :param max_points: Target number of points to keep.
+    :param min_points: Minimum number of points kept per bucket.
+    :param outlier_count: Points lying in a density grid cell holding at
+    most this many points are always kept. 0 disables it. Points with a
+    non-finite coordinate are never counted as outliers.
+    :param seed: Seed of the random generator.
+    :return: Sorted indices of the kept points.
+    """
+    n = len(x)
+    if bucket is None:
+        bucket = np.zeros(n, dtype=np.int64)
+    _, inverse, counts = _buckets(bucket)
+    quota = np.floor(counts * (max_points / max(n, 1))).astype(np.int64)
+    quota = np.minimum(np.maximum(quota, max(min_points, 1)), counts)
+
+    # Oversample by a few standard deviations so that a bucket rarely gets
+    # fewer candidates than its quota.
+    rng = np.random.default_rng(seed)
+    p = (quota + 4 * np.sqrt(quota) + 10) / np.maximum(counts, 1)
+    p = p.astype(np.float32)[inverse]
+    candidate = np.flatnonzero(rng.random(n, dtype=np.float32) < p)
+    keep = np.zeros(n, dtype=bool)
+    keep[_select(candidate, inverse[candidate], quota, rng)] = True
+
+    # Buckets short of candidates are redrawn over all of their points.
+    short = np.bincount(inverse[candidate], minlength=len(counts)) < quota
+    if short.any():
+        redraw = np.flatnonzero(short[inverse])
+        keep[redraw] = False
+        keep[_select(redraw, inverse[redraw], quota, rng)] = True
+
+    if outlier_count > 0 and n > 0:
+        # Non-finite points are left out of the density grid.
+        finite = np.isfinite(x) & np.isfinite(y)
+        if finite.all():
+            finite = slice(None)
+        if len(x[finite]) > 0:
+            cell = _cell(x[finite]) * density_bins + _cell(y[finite])
+            keep[finite] |= np.bincount(cell)[cell] <= outlier_count
+    return np.flatnonzero(keep)
+
+
+def _buckets(bucket):
+    """
+    Bucket values, bucket slot of every point and size of every slot.
+    Non-negative buckets are counted directly instead of sorted; their
+    slots are the bucket values themselves and may hold no points.
+    """
+    if len(bucket) and bucket.min() >= 0:
+        counts = np.bincount(bucket)
+        return np.arange(len(counts)), bucket, counts
+    return np.unique(bucket, return_inverse=True, return_counts=True)
+
+
+def _select(idx, slot, quota, rng):
+    """
+    Pick quota[s] random entries of idx among those in every slot s.
+    """
+    order = np.argsort(slot + rng.random(len(idx)))
+    counts = np.bincount(slot, minlength=len(quota))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(idx)) - starts[slot[order]]
+    return idx[order[rank < quota[slot[order]]]]
+
+
+def _cell(v):
+    """
+    Index of the density grid cell of every value along one axis.
+    """
+    lo, hi = v.min(), v.max()
+    scale = density_bins / (hi - lo) if hi > lo else 0
+    return np.minimum(((v - lo) * scale).astype(np.int64), density_bins - 1)
+
+
+def ratio(bucket, idx):
+    """
+    Fraction of points kept in every bucket.
+    :param bucket: An N-dimensional int numpy array.
+    :param idx: Indices of the kept points.
+    :return: A dict mapping bucket to its sampling ratio.
+    """
+    values, inverse, counts = _buckets(bucket)
+    kept = np.bincount(inverse[idx], minlength=len(counts))
+    return {
+        v: k / c
+        for v, k, c in zip(values.tolist(), kept.tolist(), counts.tolist())
+        if c > 0
+    }
+
+
+def unique(bucket):
+    """
+    Sorted unique values of an int array, counted instead of sorted when
+    they are non-negative.
+    :param bucket: An N-dimensional int numpy array.
+    :return: numpy array
+    """
+    values, _, counts = _buckets(bucket)
+    return values[counts > 0]
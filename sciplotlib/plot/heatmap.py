@@ -1,11 +1,15 @@
-import os
-
 import matplotlib.ticker
 import numpy as np
 from matplotlib import pyplot as plt
 
+from ._frame import is_frame, matrix
+from .style import Style
+
 __all__ = ["heatmap"]
 
+# Maximum number of cells along each axis rendered in preview.
+preview_cells = 32
+
 
 def heatmap(data,
             axis=False,
@@ -26,10 +30,13 @@ def heatmap(data,
             color=None,
             figsize=(6, 4),
             axis_fontsize=10,
-            val_fontsize=10):
+            val_fontsize=10,
+            style=None,
+            preview=False):
     """
     Create a heatmap from a numpy array and two lists of labels.
-    :param data: A numpy array of dimension [2, N].
+    :param data: A numpy array of dimension [2, N], or a pivoted pandas
+    DataFrame / pyarrow Table whose columns (and index) are used as labels.
     :param axis: This will remove the axis and bounding box.
     :param spines: plot spines or not.
     :param ticks: Where show ticks or not.
@@ -49,78 +56,126 @@ def heatmap(data,
     :param figsize: Width, height in inches.
     :param axis_fontsize: Axis fontsize used when remove_axis is False.
     :param val_fontsize: The fontsize of the padding value.
+    :param style: A Style. If provided, axis, spines, ticks and
+    axis_fontsize are taken from it.
+    :param preview: Render a fast low-DPI png instead of the pdf. Larger
+    heatmaps are aggregated to preview_cells cells per axis, without values
+    and with one label per block, while keeping the layout of the full
+    render.
     :return: None
     """
     if color is None:
         color = "YlGn"
+    if is_frame(data):
+        data, frame_x_labels, frame_y_labels = matrix(data)
+        if x_labels is None:
+            x_labels = frame_x_labels
+        if y_labels is None:
+            y_labels = frame_y_labels
+
+    if style is None:
+        style = Style.get(axis=axis,
+                          spines=spines,
+                          ticks=ticks,
+                          axis_fontsize=axis_fontsize)
+    values, step = data, (1, 1)
+    if preview and max(data.shape) > preview_cells:
+        values, step = _aggregate(data, preview_cells)
+        vmin = np.nanmin(data) if vmin is None else vmin
+        vmax = np.nanmax(data) if vmax is None else vmax
+    with style.context():
+        plt.figure(figsize=figsize)
+        im = plt.imshow(values,
+                        cmap=color,
+                        vmin=vmin,
+                        vmax=vmax,
+                        extent=(-.5, data.shape[1] - .5, data.shape[0] - .5,
+                                -.5))
+
+        if color_bar is True:
+            color_bar = plt.gca().figure.colorbar(im, ax=plt.gca())
+            color_bar.ax.set_ylabel(color_bar_label, rotation=-90, va="bottom")
+            color_bar.ax.spines[:].set_linewidth(grid_linewidth)
+            color_bar.ax.tick_params(labelsize=style.axis_fontsize)
+
+        if isinstance(val_fmt, str):
+            val_fmt = matplotlib.ticker.StrMethodFormatter(val_fmt)
+        # Aggregated cells of a preview carry no values. The values of a
+        # preview lie inside the axes and are left out of its layout passes.
+        if values is data:
+            for i in range(data.shape[0]):
+                for j in range(data.shape[1]):
+                    plt.text(j,
+                             i,
+                             val_fmt(data[i, j], None),
+                             ha="center",
+                             va="center",
+                             color="black",
+                             fontsize=val_fontsize,
+                             in_layout=not preview)
+
+        style.decorate(plt.gca())
+
+        pad_inches = 0
 
-    plt.figure(figsize=figsize)
-    plt.rcParams["font.family"] = "Times New Roman"
-    im = plt.imshow(data, cmap=color, vmin=vmin, vmax=vmax)
-
-    if color_bar is True:
-        color_bar = plt.gca().figure.colorbar(im, ax=plt.gca())
-        color_bar.ax.set_ylabel(color_bar_label, rotation=-90, va="bottom")
-        color_bar.ax.spines[:].set_linewidth(grid_linewidth)
-        color_bar.ax.tick_params(labelsize=axis_fontsize)
-
-    if isinstance(val_fmt, str):
-        val_fmt = matplotlib.ticker.StrMethodFormatter(val_fmt)
-    for i in range(data.shape[0]):
-        for j in range(data.shape[1]):
-            plt.text(j,
-                     i,
-                     val_fmt(data[i, j], None),
-                     ha="center",
-                     va="center",
-                     color="black",
-                     fontsize=val_fontsize)
-
-    # Spines
-    plt.gca().spines[:].set_visible(spines)
-
-    if ticks is False:
-        plt.gca().set_xticks(ticks=[])
-        plt.gca().set_yticks(ticks=[])
-        plt.gca().tick_params(axis="both",
-                              which="major",
-                              left=False,
-                              bottom=False,
-                              labelleft=False,
-                              labelbottom=False)
-
-    pad_inches = 0
-
-    # Create grid.
-    if grid is True:
-        plt.gca().set_xticks(np.arange(data.shape[1] + 1) - .5, minor=True)
-        plt.gca().set_yticks(np.arange(data.shape[0] + 1) - .5, minor=True)
-        plt.gca().grid(which="minor",
-                       color=grid_color,
-                       linewidth=grid_linewidth,
-                       fillstyle="full")
-        plt.gca().spines[:].set_linewidth(grid_linewidth)
-        plt.gca().tick_params(which="minor", bottom=False, left=False)
-        pad_inches = 1.0 / 72.0 * grid_linewidth / 2.0
-
-    plt.tight_layout()
-
-    if axis:
-        plt.xticks(fontsize=axis_fontsize)
-        plt.yticks(fontsize=axis_fontsize)
-        if x_labels is not None:
-            plt.gca().set_xticks(np.arange(len(x_labels)), labels=x_labels)
-        if y_labels is not None:
-            plt.gca().set_yticks(np.arange(len(y_labels)), labels=y_labels)
-        plt.setp(plt.gca().get_xticklabels(),
-                 rotation=45,
-                 ha="right",
-                 rotation_mode="anchor")
-    else:
-        plt.axis('off')
-
-    os.makedirs(save_path, exist_ok=True)
-    plt.savefig(os.path.join(save_path, f"{save_name}.pdf"),
-                bbox_inches="tight",
-                transparent="True",
-                pad_inches=pad_inches)
+        # Create grid.
+        if grid is True:
+            plt.gca().set_xticks(
+                np.append(np.arange(0, data.shape[1], step[1]),
+                          data.shape[1]) - .5,
+                minor=True)
+            plt.gca().set_yticks(
+                np.append(np.arange(0, data.shape[0], step[0]),
+                          data.shape[0]) - .5,
+                minor=True)
+            plt.gca().grid(which="minor",
+                           color=grid_color,
+                           linewidth=grid_linewidth,
+                           fillstyle="full")
+            plt.gca().spines[:].set_linewidth(grid_linewidth)
+            plt.gca().tick_params(which="minor", bottom=False, left=False)
+            pad_inches = 1.0 / 72.0 * grid_linewidth / 2.0
+
+        plt.tight_layout()
+
+        style.finish_axis(plt.gca())
+        if style.axis:
+            # Aggregated blocks are labelled by their first row or column.
+            if x_labels is not None:
+                plt.gca().set_xticks(np.arange(0, len(x_labels), step[1]),
+                                     labels=x_labels[::step[1]])
+            if y_labels is not None:
+                plt.gca().set_yticks(np.arange(0, len(y_labels), step[0]),
+                                     labels=y_labels[::step[0]])
+            plt.setp(plt.gca().get_xticklabels(),
+                     rotation=45,
+                     ha="right",
+                     rotation_mode="anchor")
+
+        style.save(save_path,
+                   save_name,
+                   pad_inches=pad_inches,
+                   preview=preview)
+
+
+def _aggregate(data, cells):
+    """
+    Average blocks of a 2-D array so that it has at most cells cells per
+    axis.
+    :param data: A 2-D numpy array.
+    :param cells: Maximum number of cells along each axis.
+    :return: (A 2-D numpy array, block height and width)
+    """
+    h, w = data.shape
+    bh, bw = -(-h // cells), -(-w // cells)
+    padded = np.full((-(-h // bh) * bh, -(-w // bw) * bw), np.nan)
+    padded[:h, :w] = data
+    blocks = padded.reshape(padded.shape[0] // bh, bh, padded.shape[1] // bw,
+                            bw)
+    # Blocks without any value stay NaN, without an empty mean warning.
+    filled = ~np.isnan(blocks)
+    total = np.where(filled, blocks, 0).sum(axis=(1, 3))
+    count = filled.sum(axis=(1, 3))
+    mean = np.full(total.shape, np.nan)
+    np.divide(total, count, out=mean, where=count > 0)
+    return mean, (bh, bw)
@@ -1,10 +1,15 @@
-import os
-
 import numpy as np
 from matplotlib import pyplot as plt
 
+from ._frame import column, is_frame
+from ._sample import ratio, subsample, unique
+from .style import Style
+
 __all__ = ["scatter"]
 
+# Number of points drawn in preview unless max_points is provided.
+preview_points = 20000
+
 color_map = [
     "#377EB8",
     "#4DAF4A",
@@ -67,12 +72,22 @@ def scatter(data,
             spines=True,
             ticks=False,
             legend_fontsize=15,
-            axis_fontsize=10):
+            axis_fontsize=10,
+            x=None,
+            y=None,
+            max_points=None,
+            min_points=10,
+            outlier_count=0,
+            seed=0,
+            style=None,
+            preview=False):
     """
     A scatter plot of data with varying marker size and/or color.
-    :param data: A numpy array of dimension [2, N].
+    :param data: A numpy array of dimension [2, N], or a pandas DataFrame /
+    pyarrow Table together with x and y.
     :param group: An N-dimensional int numpy array indicating that
-    data[i] belongs to the group[i]th group.
+    data[i] belongs to the group[i]th group. When data is a table, a column
+    name; categorical columns are used through their codes.
     :param group_names: If provided, it will appear on the legend.
     :param series: Series, group must not None when series is not None.
     :param series_names: If provided, it will appear on the legend.
@@ -99,116 +114,187 @@ def scatter(data,
     :param ticks: Where show ticks or not.
     :param legend_fontsize: Legend fontsize used when needed.
     :param axis_fontsize: Axis fontsize used when remove_axis is False.
+    :param x: Column name of x when data is a table.
+    :param y: Column name of y when data is a table.
+    :param max_points: If provided, subsample about max_points points,
+    stratified by group and series. Legend names are suffixed with the
+    sampling ratio of each group or series.
+    :param min_points: Minimum number of points kept per group and series
+    when subsampling.
+    :param outlier_count: When subsampling, points lying in a low-density
+    region (a grid cell holding at most outlier_count points) are kept.
+    :param seed: Seed for subsampling.
+    :param style: A Style. If provided, axis, spines, ticks, axis_fontsize
+    and the legend parameters are taken from it.
+    :param preview: Render a fast low-DPI png instead of the pdf. Unless
+    max_points is provided, about preview_points points are drawn, keeping
+    the legends and axis limits of the full render.
     :return: None
     """
     if color is None:
         color = color_map
     if marker is None:
         marker = marker_map
+    if fix_marker:
+        marker = marker[:1]
     assert series is None or group is not None, \
         "group must not None when series is not None."
-    assert group is None or group.dtype == "int64", \
-        "group must be int64 numpy array."
-    assert series is None or series.dtype == "int64", \
-        "series must be int64 numpy array."
-    if group is not None and group_names is not None:
-        assert len(group_names) == len(np.unique(group)), \
-            "The length of group_names does not match group."
-    if series is not None and series_names is not None:
-        assert len(series_names) == len(np.unique(series)), \
-            "The length of series_names does not match series."
+    group_labels = None
+    series_labels = None
+    if is_frame(data):
+        assert x is not None and y is not None, \
+            "x and y must not None when data is a table."
+        if group is not None:
+            group, group_labels = column(data, group, factorize=True)
+        if series is not None:
+            series, series_labels = column(data, series, factorize=True)
+        data = (column(data, x)[0], column(data, y)[0])
+    else:
+        assert group is None or group.dtype == "int64", \
+            "group must be int64 numpy array."
+        assert series is None or series.dtype == "int64", \
+            "series must be int64 numpy array."
+    # Colors and markers of labelled columns follow the present labels, not
+    # their codes, which may be sparse. Both maps are cycled when exceeded.
+    if group is not None:
+        group_values = unique(group)
+        group_slots = group_values
+        if group_labels is not None:
+            group_slots = np.arange(len(group_values))
+        if group_names is None and group_labels is not None:
+            group_names = [group_labels[i] for i in group_values]
+        if group_names is not None:
+            assert len(group_names) == len(group_values), \
+                "The length of group_names does not match group."
+    if series is not None:
+        series_values = unique(series)
+        series_slots = series_values
+        if series_labels is not None:
+            series_slots = np.arange(len(series_values))
+        if series_names is None and series_labels is not None:
+            series_names = [series_labels[i] for i in series_values]
+        if series_names is not None:
+            assert len(series_names) == len(series_values), \
+                "The length of series_names does not match series."
+
+    budget = max_points
+    if preview and max_points is None:
+        budget = preview_points
+    bounds = None
+    if budget is not None and len(data[0]) > budget:
+        bounds = [(np.min(data[0]), np.min(data[1])),
+                  (np.max(data[0]), np.max(data[1]))]
+        bucket = group
+        if series is not None:
+            # Category codes may be int8 and plain codes may be negative,
+            # combine them in int64 from their minimum without overlap.
+            span = int(series_values[-1]) - int(series_values[0]) + 1
+            bucket = group.astype(np.int64) - int(group_values[0])
+            bucket = bucket * span + series - int(series_values[0])
+        idx = subsample(data[0],
+                        data[1],
+                        bucket,
+                        budget,
+                        min_points=min_points,
+                        outlier_count=outlier_count,
+                        seed=seed)
+        if max_points is not None and group_names is not None:
+            if group is None:
+                group_ratio = [len(idx) / len(data[0])]
+            else:
+                group_ratio = ratio(group, idx).values()
+            group_names = [
+                f"{name} ({r:.1%})"
+                for name, r in zip(group_names, group_ratio)
+            ]
+        if max_points is not None and series_names is not None:
+            series_ratio = ratio(series, idx).values()
+            series_names = [
+                f"{name} ({r:.1%})"
+                for name, r in zip(series_names, series_ratio)
+            ]
+        data = (data[0][idx], data[1][idx])
+        if group is not None:
+            group = group[idx]
+        if series is not None:
+            series = series[idx]
 
-    plt.figure(figsize=figsize)
-    plt.rcParams["font.family"] = "Times New Roman"
-    handles_group = []
-    handles_series = []
-    if group is None and series is None:
-        handle = plt.scatter(data[0],
-                             data[1],
-                             s=s,
-                             c=color[0],
-                             marker=marker[0],
-                             alpha=alpha,
-                             linewidths=linewidths)
-        handles_group.append(handle)
-    elif series is None:
-        for i in np.unique(group):
-            idx = group == i
-            handle = plt.scatter(data[0][idx],
-                                 data[1][idx],
+    if style is None:
+        style = Style.get(axis=axis,
+                          spines=spines,
+                          ticks=ticks,
+                          axis_fontsize=axis_fontsize,
+                          fontsize=legend_fontsize,
+                          labelspacing=labelspacing,
+                          handletextpad=handletextpad,
+                          handlelength=handlelength,
+                          borderpad=borderpad,
+                          markerscale=markerscale,
+                          fancybox=fancybox,
+                          framealpha=framealpha)
+    with style.context():
+        plt.figure(figsize=figsize)
+        if bounds is not None:
+            # Keep the axis limits of the points left out.
+            plt.gca().update_datalim(bounds)
+        handles_group = []
+        handles_series = []
+        if group is None and series is None:
+            handle = plt.scatter(data[0],
+                                 data[1],
                                  s=s,
-                                 c=color[i],
-                                 marker=marker[0] if fix_marker else marker[i],
+                                 c=color[0],
+                                 marker=marker[0],
                                  alpha=alpha,
                                  linewidths=linewidths)
             handles_group.append(handle)
-    else:
-        for j in np.unique(group):
-            for i in np.unique(series):
-                idx = (series == i) & (group == j)
+        elif series is None:
+            for i, gi in zip(group_values, group_slots):
+                idx = group == i
                 handle = plt.scatter(
                     data[0][idx],
                     data[1][idx],
                     s=s,
-                    c=color[i],
-                    marker=marker[0] if fix_marker else marker[j],
+                    c=color[gi % len(color)],
+                    marker=marker[gi % len(marker)],
                     alpha=alpha,
                     linewidths=linewidths)
-                handles_series.append(handle)
-                if i == 0:
-                    handles_group.append(handle)
-
-    if group_names is not None:
-        legend_group = plt.legend(handles=handles_group,
-                                  labels=group_names,
-                                  loc=loc,
-                                  fontsize=legend_fontsize,
-                                  labelspacing=labelspacing,
-                                  handletextpad=handletextpad,
-                                  handlelength=handlelength,
-                                  borderpad=borderpad,
-                                  markerscale=markerscale,
-                                  fancybox=fancybox,
-                                  framealpha=framealpha)
-        for lh in legend_group.legendHandles:
-            lh.set_alpha(alpha)
-        plt.gca().add_artist(legend_group)
-    if series_names is not None:
-        legend_series = plt.legend(handles=handles_series,
-                                   labels=series_names,
-                                   loc=loc_series,
-                                   fontsize=legend_fontsize,
-                                   labelspacing=labelspacing,
-                                   handletextpad=handletextpad,
-                                   handlelength=handlelength,
-                                   borderpad=borderpad,
-                                   markerscale=markerscale,
-                                   fancybox=fancybox,
-                                   framealpha=framealpha)
-        for lh in legend_series.legendHandles:
-            lh.set_alpha(alpha)
-        plt.gca().add_artist(legend_series)
+                handles_group.append(handle)
+        else:
+            for j, gj in zip(group_values, group_slots):
+                for i, si in zip(series_values, series_slots):
+                    idx = (series == i) & (group == j)
+                    handle = plt.scatter(
+                        data[0][idx],
+                        data[1][idx],
+                        s=s,
+                        c=color[si % len(color)],
+                        marker=marker[gj % len(marker)],
+                        alpha=alpha,
+                        linewidths=linewidths)
+                    # Codes need not start at 0, e.g. unused categories.
+                    if j == group_values[0]:
+                        handles_series.append(handle)
+                    if i == series_values[0]:
+                        handles_group.append(handle)
 
-    # Spines
-    plt.gca().spines[:].set_visible(spines)
+        if group_names is not None:
+            legend_group = plt.legend(handles=handles_group,
+                                      labels=group_names,
+                                      loc=loc,
+                                      **style.legend)
+            for lh in legend_group.legendHandles:
+                lh.set_alpha(alpha)
+            plt.gca().add_artist(legend_group)
+        if series_names is not None:
+            legend_series = plt.legend(handles=handles_series,
+                                       labels=series_names,
+                                       loc=loc_series,
+                                       **style.legend)
+            for lh in legend_series.legendHandles:
+                lh.set_alpha(alpha)
+            plt.gca().add_artist(legend_series)
 
-    if ticks is False:
-        plt.gca().set_xticks(ticks=[])
-        plt.gca().set_yticks(ticks=[])
-        plt.gca().tick_params(axis="both",
-                              which="major",
-                              left=False,
-                              bottom=False,
-                              labelleft=False,
-                              labelbottom=False)
-
-    if axis:
-        plt.xticks(fontsize=axis_fontsize)
-        plt.yticks(fontsize=axis_fontsize)
-    else:
-        plt.axis('off')
-    os.makedirs(save_path, exist_ok=True)
-    plt.savefig(os.path.join(save_path, f"{save_name}.pdf"),
-                bbox_inches="tight",
-                transparent="True",
-                pad_inches=0)
+        style.decorate(plt.gca())
+        style.finish_axis(plt.gca())
+        style.save(save_path, save_name, preview=preview)
@@ -0,0 +1,138 @@
+import os
+
+from matplotlib import pyplot as plt
+
+__all__ = ["Style"]
+
+# Resolution of preview renders.
+preview_dpi = 72
+
+
+class Style(object):
+    """
+    A figure style shared by all plot types.
+    The style is compiled once into rc parameters, tick parameters and
+    legend parameters, then applied stage by stage to every figure drawn
+    with it:
+        with style.context():
+            plt.figure()
+            ...  # plot
+            style.decorate(plt.gca())
+            ...  # plot specific decorations
+            style.finish_axis(plt.gca())
+            style.save(save_path, save_name)
+    """
+
+    _cache = {}
+
+    def __init__(self,
+                 font_family="Times New Roman",
+                 axis=True,
+                 spines=True,
+                 ticks=True,
+                 axis_fontsize=10,
+                 spine_linewidth=None,
+                 **legend):
+        """
+        :param font_family: Font family of all texts.
+        :param axis: This will remove the axis and bounding box.
+        :param spines: plot spines or not.
+        :param ticks: Where show ticks or not.
+        :param axis_fontsize: Axis fontsize used when axis is True.
+        :param spine_linewidth: Line width of spines, None keeps default.
+        :param legend: Keyword arguments passed to every legend, e.g.
+        fontsize, labelspacing, handletextpad, framealpha.
+        """
+        self.axis = axis
+        self.spines = spines
+        self.ticks = ticks
+        self.axis_fontsize = axis_fontsize
+        self.spine_linewidth = spine_linewidth
+        self.rc = {"font.family": font_family}
+        self.tick_params = None
+        if ticks is False:
+            self.tick_params = dict(axis="both",
+                                    which="major",
+                                    left=False,
+                                    bottom=False,
+                                    labelleft=False,
+                                    labelbottom=False)
+        self.legend = legend
+
+    @classmethod
+    def get(cls, **kwargs):
+        """
+        Get a compiled style, reusing it across calls with the same
+        arguments.
+        :param kwargs: Arguments of Style.
+        :return: Style
+        """
+        key = tuple(sorted(kwargs.items()))
+        style = cls._cache.get(key)
+        if style is None:
+            style = cls._cache[key] = cls(**kwargs)
+        return style
+
+    def context(self):
+        """
+        Scope the rc parameters of the style, leaving the global rcParams
+        untouched.
+        :return: A context manager.
+        """
+        return plt.rc_context(self.rc)
+
+    def decorate(self, ax):
+        """
+        Apply spines and ticks.
+        :param ax: matplotlib Axes.
+        :return: None
+        """
+        ax.spines[:].set_visible(self.spines)
+        if self.spine_linewidth is not None:
+            ax.spines[:].set_linewidth(self.spine_linewidth)
+        if self.tick_params is not None:
+            ax.set_xticks(ticks=[])
+            ax.set_yticks(ticks=[])
+            ax.tick_params(**self.tick_params)
+
+    def finish_axis(self, ax):
+        """
+        Apply the axis fontsize, or remove the axis.
+        :param ax: matplotlib Axes.
+        :return: None
+        """
+        if self.axis:
+            ax.tick_params(labelsize=self.axis_fontsize)
+        else:
+            ax.axis("off")
+
+    def save(self, save_path, save_name, pad_inches=0, preview=False):
+        """
+        Save the current figure as pdf, or as a low-DPI png in preview.
+        :param save_path: Save path.
+        :param save_name: Save name.
+        :param pad_inches: Padding around the figure.
+        :param preview: Save a png rendered by Agg at preview_dpi.
+        :return: None
+        """
+        os.makedirs(save_path, exist_ok=True)
+        if preview:
+            # Draw once: any layout is already applied, the tight bbox is
+            # computed from the layout alone instead of a full draw, and the
+            # figure is not redrawn after.
+            fig = plt.gcf()
+            fig.set_layout_engine(None)
+            bbox = "tight"
+            if hasattr(fig.canvas, "get_renderer"):
+                renderer = fig.canvas.get_renderer()
+                bbox = fig.get_tightbbox(renderer).padded(pad_inches)
+            fig.savefig(os.path.join(save_path, f"{save_name}.png"),
+                        dpi=preview_dpi,
+                        bbox_inches=bbox,
+                        transparent="True",
+                        pad_inches=pad_inches)
+            return
+        plt.savefig(os.path.join(save_path, f"{save_name}.pdf"),
+                    bbox_inches="tight",
+                    transparent="True",
+                    pad_inches=pad_inches)
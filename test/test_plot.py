@@ -1,11 +1,40 @@
 import inspect
 import os.path
 import sys
+import tempfile
+import time
 import unittest
+import warnings
 
+import matplotlib
 import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.legend import Legend
+from PIL import Image
 
 from sciplotlib import plot
+from sciplotlib.plot import _sample
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def legend_texts():
+    """
+    Texts of every legend of the current axes, in drawing order.
+    """
+    legends = []
+    for child in plt.gca().get_children():
+        if isinstance(child, Legend) and child not in legends:
+            legends.append(child)
+    return [[t.get_text() for t in legend.get_texts()] for legend in legends]
 
 
 class TestScatter(unittest.TestCase):
@@ -237,6 +266,250 @@ class TestScatter(unittest.TestCase):
                                f"{self.__class__.__name__}."
                                f"{inspect.currentframe().f_code.co_name}")
 
+    def test_style(self):
+        font_family = matplotlib.rcParams["font.family"]
+        style = plot.Style(ticks=True, fontsize=12)
+        data = np.random.randn(2, 100)
+        group_names = ['test style']
+        plot.scatter(data,
+                     group_names=group_names,
+                     style=style,
+                     save_path=os.path.join(sys.path[0], '../examples'),
+                     save_name=f"{os.path.basename(__file__.split('.')[0])}."
+                               f"{self.__class__.__name__}."
+                               f"{inspect.currentframe().f_code.co_name}")
+        self.assertEqual(matplotlib.rcParams["font.family"], font_family)
+
+    def test_preview(self):
+        data = np.random.randn(2, 50000)
+        group = np.random.randint(0, 4, 50000).astype(np.int64)
+        group_names = [f"group_{i}" for i in range(4)]
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(data,
+                         group=group,
+                         group_names=group_names,
+                         preview=True,
+                         save_path=save_path)
+            with Image.open(os.path.join(save_path, "scatter.png")) as image:
+                np.testing.assert_allclose(image.info["dpi"], (72, 72),
+                                           atol=0.01)
+        # About 20000 points (preview_points) are drawn.
+        points = sum(len(c.get_offsets()) for c in plt.gca().collections)
+        self.assertLessEqual(points, 20000)
+        self.assertGreater(points, 19900)
+        self.assertEqual(legend_texts(), [group_names])
+
+    def test_max_points(self):
+        data = np.random.randn(2, 10000)
+        group = np.repeat(np.arange(4), [7000, 2500, 490, 10])
+        group_names = [f"group_{i}" for i in range(4)]
+        plot.scatter(data,
+                     group=group,
+                     group_names=group_names,
+                     max_points=1000,
+                     save_path=os.path.join(sys.path[0], '../examples'),
+                     save_name=f"{os.path.basename(__file__.split('.')[0])}."
+                               f"{self.__class__.__name__}."
+                               f"{inspect.currentframe().f_code.co_name}")
+        self.assertEqual(legend_texts(), [[
+            "group_0 (10.0%)", "group_1 (10.0%)", "group_2 (10.0%)",
+            "group_3 (100.0%)"
+        ]])
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame(self):
+        frame = pd.DataFrame({
+            "x": np.random.randn(40),
+            "y": np.random.randn(40),
+            "group": pd.Categorical(np.repeat(["a", "b", "c", "d"], 10)),
+        })
+        plot.scatter(frame,
+                     x="x",
+                     y="y",
+                     group="group",
+                     save_path=os.path.join(sys.path[0], '../examples'),
+                     save_name=f"{os.path.basename(__file__.split('.')[0])}."
+                               f"{self.__class__.__name__}."
+                               f"{inspect.currentframe().f_code.co_name}")
+        self.assertEqual(legend_texts(), [["a", "b", "c", "d"]])
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame_max_points(self):
+        # 400 buckets of 20 points, int8 codes must not merge them.
+        names = [f"{i:02d}" for i in range(20)]
+        frame = pd.DataFrame({
+            "x": np.random.randn(8000),
+            "y": np.random.randn(8000),
+            "group": pd.Categorical(np.repeat(names, 400)),
+            "series": pd.Categorical(np.tile(np.repeat(names, 20), 20)),
+        })
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(frame,
+                         x="x",
+                         y="y",
+                         group="group",
+                         series="series",
+                         max_points=400,
+                         min_points=10,
+                         save_path=save_path)
+        points = sum(len(c.get_offsets()) for c in plt.gca().collections)
+        self.assertEqual(points, 400 * 10)
+
+    def test_max_points_negative_series(self):
+        # (group 0, series 0) and (group 1, series -1) must stay apart.
+        group = np.repeat([0, 0, 1, 1], [500, 500, 20, 500])
+        series = np.repeat([-1, 0, -1, 0], [500, 500, 20, 500])
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(np.random.randn(2, len(group)),
+                         group=group,
+                         series=series,
+                         max_points=40,
+                         min_points=10,
+                         save_path=save_path)
+        points = [len(c.get_offsets()) for c in plt.gca().collections]
+        self.assertEqual(points, [13, 13, 10, 13])
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame_unused_categories(self):
+        frame = pd.DataFrame({
+            "x": np.random.randn(80),
+            "y": np.random.randn(80),
+            "group": pd.Categorical(np.tile(np.repeat(["a", "b"], 10), 4)),
+            "series": pd.Categorical(np.repeat(["p", "q", "r", "s"], 20)),
+        })
+        frame = frame[frame.series == "q"]
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(frame,
+                         x="x",
+                         y="y",
+                         group="group",
+                         series="series",
+                         save_path=save_path)
+        self.assertEqual(legend_texts(), [["a", "b"], ["q"]])
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame_string_group(self):
+        frame = pd.DataFrame({
+            "x": np.random.randn(30),
+            "y": np.random.randn(30),
+            "group": np.repeat(["c", "a", "b"], 10),
+        })
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(frame, x="x", y="y", group="group",
+                         save_path=save_path)
+        self.assertEqual(legend_texts(), [["a", "b", "c"]])
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed.")
+    def test_arrow_table(self):
+        group = pa.chunked_array([
+            pa.array(["a", "b", "a"] * 10).dictionary_encode(),
+            pa.array(["c", "a"] * 10).dictionary_encode(),
+        ])
+        table = pa.table({
+            "x": np.random.randn(50),
+            "y": np.random.randn(50),
+            "group": group,
+        })
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(table, x="x", y="y", group="group",
+                         save_path=save_path)
+        self.assertEqual(legend_texts(), [["a", "b", "c"]])
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed.")
+    def test_arrow_table_string_group(self):
+        group = ["c", "a", "b", "c", "a"] * 10
+        table = pa.table({
+            "x": np.random.randn(50),
+            "y": np.random.randn(50),
+            "group": group,
+        })
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(table, x="x", y="y", group="group",
+                         save_path=save_path)
+            arrow_legend = legend_texts()
+            arrow_colors = [
+                c.get_facecolor().tolist() for c in plt.gca().collections
+            ]
+            plot.scatter(table.to_pandas(), x="x", y="y", group="group",
+                         save_path=save_path)
+        self.assertEqual(arrow_legend, [["a", "b", "c"]])
+        self.assertEqual(legend_texts(), arrow_legend)
+        self.assertEqual(
+            [c.get_facecolor().tolist() for c in plt.gca().collections],
+            arrow_colors)
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame_sparse_codes(self):
+        categories = [f"c{i}" for i in range(21)]
+        frame = pd.DataFrame({
+            "x": np.random.randn(10),
+            "y": np.random.randn(10),
+            "group": pd.Categorical(["c20"] * 10, categories=categories),
+        })
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.scatter(frame, x="x", y="y", group="group",
+                         save_path=save_path)
+        self.assertEqual(legend_texts(), [["c20"]])
+        np.testing.assert_allclose(
+            plt.gca().collections[0].get_facecolor()[0, :3],
+            matplotlib.colors.to_rgb("#377EB8"))
+
+
+class TestSample(unittest.TestCase):
+    x = np.random.RandomState(0).randn(10000)
+    y = np.random.RandomState(1).randn(10000)
+    bucket = np.repeat(np.arange(4), [7000, 2500, 490, 10])
+
+    def test_min_points(self):
+        idx = _sample.subsample(self.x, self.y, self.bucket, 1000,
+                                min_points=10)
+        counts = np.bincount(self.bucket[idx], minlength=4)
+        self.assertEqual(counts.tolist(), [700, 250, 49, 10])
+
+    def test_proportional(self):
+        idx = _sample.subsample(self.x, self.y, self.bucket, 2000,
+                                min_points=1)
+        counts = np.bincount(self.bucket[idx], minlength=4)
+        np.testing.assert_allclose(counts / np.bincount(self.bucket),
+                                   0.2,
+                                   atol=0.01)
+
+    def test_seed(self):
+        idx = _sample.subsample(self.x, self.y, self.bucket, 1000, seed=3)
+        np.testing.assert_array_equal(
+            idx, _sample.subsample(self.x, self.y, self.bucket, 1000, seed=3))
+        self.assertFalse(
+            np.array_equal(
+                idx,
+                _sample.subsample(self.x, self.y, self.bucket, 1000, seed=4)))
+
+    def test_outlier_count(self):
+        x = np.append(self.x, 50.0)
+        y = np.append(self.y, 50.0)
+        bucket = np.append(self.bucket, 0)
+        idx = _sample.subsample(x, y, bucket, 100)
+        self.assertNotIn(len(x) - 1, idx)
+        idx = _sample.subsample(x, y, bucket, 100, outlier_count=1)
+        self.assertIn(len(x) - 1, idx)
+
+    def test_outlier_count_non_finite(self):
+        x = np.append(self.x, [np.nan, 0.0, 50.0])
+        y = np.append(self.y, [0.0, np.nan, 50.0])
+        bucket = np.append(self.bucket, [0, 0, 0])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            idx = _sample.subsample(x, y, bucket, 100, outlier_count=1)
+        self.assertIn(len(x) - 1, idx)
+
+    def test_ratio(self):
+        idx = _sample.subsample(self.x, self.y, self.bucket, 1000,
+                                min_points=10)
+        self.assertEqual(len(idx), 1009)
+        ratio = _sample.ratio(self.bucket, idx)
+        self.assertEqual(list(ratio.keys()), [0, 1, 2, 3])
+        np.testing.assert_allclose(list(ratio.values()),
+                                   [0.1, 0.1, 0.1, 1.0])
+
 
 class TestHeatMap(unittest.TestCase):
     data = np.array([[0.8, 2.4, 2.5, 3.9, 0.0, 4.0, 0.0],
@@ -336,6 +609,79 @@ class TestHeatMap(unittest.TestCase):
                                f"{self.__class__.__name__}."
                                f"{inspect.currentframe().f_code.co_name}")
 
+    def test_preview(self):
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.heatmap(np.random.rand(100, 100),
+                         axis=True,
+                         color_bar=True,
+                         grid=True,
+                         preview=True,
+                         save_path=save_path)
+            with Image.open(os.path.join(save_path, "heatmap.png")) as image:
+                np.testing.assert_allclose(image.info["dpi"], (72, 72),
+                                           atol=0.01)
+        self.assertEqual(plt.gca().images[0].get_array().shape, (25, 25))
+        self.assertEqual(len(plt.gca().texts), 0)
+
+    def test_preview_time(self):
+        data = np.random.rand(32, 32)
+        elapsed = []
+        with tempfile.TemporaryDirectory() as save_path:
+            for preview in (False, True):
+                start = time.perf_counter()
+                plot.heatmap(data,
+                             axis=True,
+                             color_bar=True,
+                             grid=True,
+                             preview=preview,
+                             save_path=save_path)
+                elapsed.append(time.perf_counter() - start)
+                self.assertEqual(len(plt.gca().texts), 32 * 32)
+                plt.close("all")
+        self.assertLess(elapsed[1], elapsed[0] * 0.75)
+
+    def test_preview_labels(self):
+        labels = [f"label {i}" for i in range(100)]
+        with tempfile.TemporaryDirectory() as save_path:
+            plot.heatmap(np.random.rand(100, 100),
+                         axis=True,
+                         x_labels=labels,
+                         y_labels=labels,
+                         preview=True,
+                         save_path=save_path)
+        self.assertEqual(
+            [t.get_text() for t in plt.gca().get_xticklabels()],
+            labels[::4])
+
+    def test_preview_empty_block(self):
+        data = np.random.rand(100, 100)
+        data[:4, :4] = np.nan
+        with tempfile.TemporaryDirectory() as save_path:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("error", "Mean of empty slice")
+                plot.heatmap(data, preview=True, save_path=save_path)
+        values = plt.gca().images[0].get_array()
+        self.assertTrue(values.mask[0, 0])
+        self.assertAlmostEqual(values[0, 1], np.mean(data[:4, 4:8]))
+
+    @unittest.skipIf(pd is None, "pandas is not installed.")
+    def test_data_frame(self):
+        frame = pd.DataFrame(self.data,
+                             index=self.y_labels,
+                             columns=self.x_labels)
+        plot.heatmap(frame,
+                     axis=True,
+                     save_path=os.path.join(sys.path[0], '../examples'),
+                     save_name=f"{os.path.basename(__file__.split('.')[0])}."
+                               f"{self.__class__.__name__}."
+                               f"{inspect.currentframe().f_code.co_name}")
+        self.assertEqual(
+            [t.get_text() for t in plt.gca().get_xticklabels()],
+            self.x_labels)
+        self.assertEqual(
+            [t.get_text() for t in plt.gca().get_yticklabels()],
+            self.y_labels)
+
 
 if __name__ == "__main__":
     unittest.main()